@@ -0,0 +1,161 @@
+"""ASGI entry point, for serving the app from an async server.
+
+    uvicorn asgi:application --workers 2
+
+The Flask views stay synchronous; this module decides what happens on the
+event loop and what happens on threads. Request bodies are received on the
+loop and spooled to memory or disk, so a slow client sending a large CSV
+holds no thread until its upload is complete. Responses are sent back from
+the loop too. Views run on two bounded thread pools: uploads and chart
+renders get a small pool of their own, so they cannot starve fast requests
+such as /dashboard-data, and the rendering itself runs in the app's render
+process pool.
+
+Because the body is received in full first, /upload-progress only reports
+progress once parsing starts.
+"""
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from app import app, resume_jobs, shutdown_executors
+
+# Requests that can keep a thread busy for seconds
+SLOW_PATHS = {'/upload', '/api/sales/bulk', '/visualize', '/download-report'}
+
+fast_executor = ThreadPoolExecutor(max_workers=app.config['ASGI_THREADS'],
+                                   thread_name_prefix='asgi')
+slow_executor = ThreadPoolExecutor(max_workers=app.config['ASGI_SLOW_THREADS'],
+                                   thread_name_prefix='asgi-slow')
+
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP ``scope`` whose body is the file ``body``."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        # PEP 3333 strings carry raw bytes as latin-1
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.input_terminated': True,  # The body is complete even without Content-Length
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            value = environ[name] + ('; ' if name == 'HTTP_COOKIE' else ', ') + value
+        environ[name] = value
+    return environ
+
+
+def run_wsgi(environ, send_message):
+    """Run the Flask app on the calling thread, passing ASGI messages to ``send_message``."""
+    status_headers = []
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and status_headers and status_headers[0] is None:
+            raise exc_info[1].with_traceback(exc_info[2])
+        status_headers[:] = [(int(status.split(' ', 1)[0]), headers)]
+        return write
+
+    def start():
+        if not status_headers or status_headers[0] is None:
+            raise RuntimeError('The application did not call start_response')
+        status, headers = status_headers[0]
+        status_headers[0] = None  # Marks the response as started
+        send_message({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+        })
+
+    def write(data):
+        if status_headers[0] is not None:
+            start()
+        send_message({'type': 'http.response.body', 'body': data, 'more_body': True})
+
+    result = app(environ, start_response)
+    try:
+        # Hold back one chunk so the last one goes out with more_body=False;
+        # most responses are a single chunk and need a single message
+        pending = None
+        for chunk in result:
+            if not chunk:
+                continue
+            if pending is not None:
+                write(pending)
+            pending = chunk
+        if status_headers[0] is not None:
+            start()
+        send_message({'type': 'http.response.body', 'body': pending or b'', 'more_body': False})
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+
+
+async def receive_body(receive):
+    """Spool the request body; returns None if the client disconnects first."""
+    body = SpooledTemporaryFile(max_size=app.config['ASGI_SPOOL_MEMORY'])
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            body.close()
+            return None
+        body.write(message.get('body', b''))
+        if not message.get('more_body'):
+            body.seek(0)
+            return body
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            with app.app_context():
+                resume_jobs()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            fast_executor.shutdown(wait=False)
+            slow_executor.shutdown(wait=False)
+            shutdown_executors()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        raise ValueError(f"Unsupported ASGI scope: {scope['type']}")
+
+    body = await receive_body(receive)
+    if body is None:
+        return
+    loop = asyncio.get_running_loop()
+
+    def send_message(message):
+        # Called from the worker thread; waits until the loop has sent it
+        asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+    executor = slow_executor if scope['path'] in SLOW_PATHS else fast_executor
+    try:
+        await loop.run_in_executor(executor, run_wsgi, build_environ(scope, body), send_message)
+    finally:
+        body.close()
@@ -0,0 +1,337 @@
+"""Load benchmark for the Flask endpoints.
+
+Seeds a throwaway database with synthetic transactions, menu items and sales,
+then drives the endpoints from several concurrent clients and prints latency
+percentiles and throughput per endpoint, and the run's peak RSS, as JSON, so
+runs from two releases can be diffed.
+
+    python benchmark.py --scale 100k --concurrency 8 --output bench.json
+
+By default requests go through Flask's test client in this process. With
+--url they are sent over HTTP to a running server instead; that server must
+use the same database (set DATABASE_URL for both), since sales are seeded
+directly. Peak RSS is the high-water mark of the benchmarking process over
+the whole run (seeding included), so in --url mode it measures the load
+generator rather than the server.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+CATEGORIES = ['Food', 'Transport', 'Utilities', 'Rent', 'Supplies', 'Salaries', 'Entertainment']
+RECIPIENTS = [f'Vendor {i}' for i in range(40)]
+MENU_CATEGORIES = ['Main Course', 'Protein', 'Side', 'Drinks', 'Dessert']
+PAYMENT_METHODS = ['Cash', 'Card', 'Transfer']
+EMAIL = 'bench@example.com'
+PASSWORD = 'bench-password'
+REGISTRATION = {'name': 'Bench', 'email': EMAIL, 'password': PASSWORD, 'confirm_password': PASSWORD}
+
+
+def synthetic_transactions(rows, seed=0, days=365):
+    """A transactions CSV frame in the upload format, with a few outliers."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    offsets = np.sort(rng.integers(0, days * 24 * 3600, rows))
+    amounts = rng.lognormal(mean=8, sigma=0.6, size=rows).round(2)
+    outliers = rng.random(rows) < 0.01
+    amounts[outliers] *= 20
+    return pd.DataFrame({
+        'date': (pd.Timestamp(start) + pd.to_timedelta(offsets, unit='s')).strftime('%Y-%m-%d'),
+        'amount': amounts,
+        'category': rng.choice(CATEGORIES, rows),
+        'description': 'synthetic',
+        'recipient': rng.choice(RECIPIENTS, rows),
+    })
+
+
+def seed_sales(app_module, user_id, rows, seed=0, days=365, menu_size=30):
+    """Insert menu items and ``rows`` sales (1-3 items each) and fold them into the rollups."""
+    A = app_module
+    db = A.db
+    rng = np.random.default_rng(seed + 1)
+    with A.app.app_context():
+        menu = [{'name': f'Dish {i}', 'category': MENU_CATEGORIES[i % len(MENU_CATEGORIES)],
+                 'price': float(500 + 100 * (i % 15)), 'cost': float(200 + 40 * (i % 15)),
+                 'is_active': True} for i in range(menu_size)]
+        db.session.execute(db.insert(A.MenuItem), menu)
+        menu_ids = np.array(db.session.execute(db.select(A.MenuItem.id)).scalars().all())
+        prices = dict(db.session.execute(db.select(A.MenuItem.id, A.MenuItem.price)).all())
+
+        first_id = (db.session.execute(db.select(db.func.max(A.Sale.id))).scalar() or 0) + 1
+        sale_ids = np.arange(first_id, first_id + rows)
+        dates = pd.Timestamp(datetime(2024, 1, 1)) + pd.to_timedelta(
+            rng.integers(0, days * 24 * 3600, rows), unit='s')
+
+        per_sale = rng.integers(1, 4, rows)
+        item_sale_ids = np.repeat(sale_ids, per_sale)
+        items = pd.DataFrame({
+            'sale_id': item_sale_ids,
+            'menu_item_id': rng.choice(menu_ids, len(item_sale_ids)),
+            'quantity': rng.integers(1, 4, len(item_sale_ids)),
+            'date': np.repeat(dates, per_sale),
+        })
+        items['price_at_sale'] = items['menu_item_id'].map(prices)
+        line_totals = (items['quantity'] * items['price_at_sale']).groupby(items['sale_id']).sum()
+
+        sales = pd.DataFrame({
+            'id': sale_ids,
+            'user_id': user_id,
+            'date': dates,
+            'total_amount': line_totals.reindex(sale_ids).to_numpy(),
+            'payment_method': rng.choice(PAYMENT_METHODS, rows),
+            'customer_count': rng.integers(1, 6, rows),
+        })
+
+        chunk = A.app.config['UPLOAD_CHUNK_SIZE']
+        sale_records = sales.assign(date=sales['date'].dt.to_pydatetime()).to_dict('records')
+        item_records = items[['sale_id', 'menu_item_id', 'quantity', 'price_at_sale']].to_dict('records')
+        for start in range(0, len(sale_records), chunk):
+            db.session.execute(db.insert(A.Sale), sale_records[start:start + chunk])
+        for start in range(0, len(item_records), chunk):
+            db.session.execute(db.insert(A.SaleItem), item_records[start:start + chunk])
+        A.update_sale_rollups(user_id, sales, items)
+        A.bump_data_version(user_id)
+        db.session.commit()
+
+
+class TestClientDriver:
+    """Sends requests through Flask's test client; one client per thread."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def login(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self.app.test_client()
+            client.post('/login', data={'email': EMAIL, 'password': PASSWORD})
+            self._local.client = client
+        return client
+
+    def register(self):
+        self.app.test_client().post('/register', data=REGISTRATION)
+
+    def request(self, method, path, json_body=None, data=None, content_type=None):
+        response = self.login().open(path, method=method, json=json_body, data=data,
+                                       content_type=content_type)
+        body = response.get_data()
+        return response.status_code, len(body)
+
+
+class HttpDriver:
+    """Sends requests to a running server over HTTP; one cookie jar per thread."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self._local = threading.local()
+
+    def login(self):
+        opener = getattr(self._local, 'opener', None)
+        if opener is None:
+            opener = urllib.request.build_opener(
+                urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+            form = urllib.parse.urlencode({'email': EMAIL, 'password': PASSWORD}).encode()
+            opener.open(f'{self.base_url}/login', data=form).read()
+            self._local.opener = opener
+        return opener
+
+    def register(self):
+        form = urllib.parse.urlencode(REGISTRATION).encode()
+        urllib.request.urlopen(f'{self.base_url}/register', data=form).read()
+
+    def request(self, method, path, json_body=None, data=None, content_type=None):
+        headers = {}
+        if json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+        elif isinstance(data, dict):
+            data = urllib.parse.urlencode(data).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif content_type:
+            headers['Content-Type'] = content_type
+        req = urllib.request.Request(f'{self.base_url}{path}', data=data, headers=headers, method=method)
+        try:
+            with self.login().open(req) as response:
+                return response.status, len(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, len(e.read())
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def percentile(latencies, q):
+    return round(float(np.percentile(latencies, q)) * 1000, 2) if latencies else None
+
+
+def warm_up(driver, pool, concurrency):
+    # Log every worker thread in before timing; the barrier keeps one thread
+    # from taking several of these tasks
+    barrier = threading.Barrier(concurrency)
+
+    def login(_):
+        driver.login()
+        barrier.wait()
+
+    list(pool.map(login, range(concurrency)))
+
+
+def run_endpoint(driver, pool, requests, count):
+    """Issue ``count`` requests cycling through ``requests`` on the worker pool."""
+    latencies = []
+    errors = 0
+    bytes_out = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors, bytes_out
+        method, path, kwargs = requests[i % len(requests)]
+        started = time.perf_counter()
+        try:
+            status, size = driver.request(method, path, **kwargs)
+        except Exception:
+            status, size = None, 0
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            bytes_out += size
+            if status is None or status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    list(pool.map(one, range(count)))
+    wall = time.perf_counter() - started
+
+    return {
+        'requests': count,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'mean_ms': round(float(np.mean(latencies)) * 1000, 2) if latencies else None,
+        'throughput_rps': round(count / wall, 1) if wall > 0 else None,
+        'bytes_per_request': int(bytes_out / count) if count else 0,
+    }
+
+
+def endpoint_plan(upload_rows):
+    upload_csv = synthetic_transactions(upload_rows, seed=99).to_csv(index=False).encode()
+    charts = ['revenue', 'top-items', 'heatmap', 'payment-methods']
+    return {
+        'upload': [('POST', '/upload', {'data': upload_csv, 'content_type': 'text/csv'})],
+        'visualize': [('POST', '/visualize', {'json_body': {'chart_id': c}}) for c in charts],
+        'dashboard-data': [('GET', '/dashboard-data?include_plot=0', {})],
+        'download-report': [('POST', '/download-report', {})],
+        'report': [('POST', '/report', {'data': {'report_type': t}})
+                   for t in ('summary', 'anomalies')],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', choices=SCALES, default='1k',
+                        help='Seeded transactions and sales (default: 1k)')
+    parser.add_argument('--rows', type=int, help='Exact row count; overrides --scale')
+    parser.add_argument('--requests', type=int, default=50, help='Requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients')
+    parser.add_argument('--upload-rows', type=int, default=1000, help='Rows per benchmarked /upload request')
+    parser.add_argument('--endpoints', nargs='+', help='Only run these endpoints')
+    parser.add_argument('--no-chart-cache', action='store_true',
+                        help='Disable the rendered chart cache so every chart is drawn')
+    parser.add_argument('--url', help='Benchmark a running server at this URL instead of the test client')
+    parser.add_argument('--output', help='Write the JSON report here as well as to stdout')
+    args = parser.parse_args(argv)
+    rows = args.rows or SCALES[args.scale]
+
+    workdir = None
+    if 'DATABASE_URL' not in os.environ:
+        workdir = tempfile.mkdtemp(prefix='bench-')
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    import app as A  # Imported late so DATABASE_URL above takes effect
+    if workdir:
+        A.app.instance_path = workdir
+        A.chart_cache.disk_dir = os.path.join(workdir, 'chart_cache')
+        A.snapshot_store.root = os.path.join(workdir, 'snapshots')
+    if args.no_chart_cache:
+        A.chart_cache.max_bytes = 0
+        A.chart_cache.disk_dir = None
+
+    with A.app.app_context():
+        A.init_database()
+    driver = HttpDriver(args.url) if args.url else TestClientDriver(A.app)
+
+    # Seed: one user, ``rows`` transactions via the streaming upload and ``rows`` sales
+    started = time.perf_counter()
+    driver.register()
+    driver.request('GET', '/dashboard')  # First dashboard load starts the user from empty
+    csv = synthetic_transactions(rows).to_csv(index=False).encode()
+    driver.request('POST', '/upload', data=csv, content_type='text/csv')
+    with A.app.app_context():
+        user_id = A.db.session.execute(
+            A.db.select(A.User.id).where(A.User.email == EMAIL)).scalar()
+    seed_sales(A, user_id, rows)
+    seed_seconds = time.perf_counter() - started
+
+    plan = endpoint_plan(args.upload_rows)
+    selected = args.endpoints or list(plan)
+    results = {}
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        warm_up(driver, pool, args.concurrency)
+        for name in selected:
+            results[name] = run_endpoint(driver, pool, plan[name], args.requests)
+            print(f"{name}: p50={results[name]['p50_ms']}ms p95={results[name]['p95_ms']}ms "
+                  f"errors={results[name]['errors']}", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'rows': rows,
+            'requests_per_endpoint': args.requests,
+            'concurrency': args.concurrency,
+            'upload_rows': args.upload_rows,
+            'driver': 'http' if args.url else 'test-client',
+            'chart_cache': not args.no_chart_cache,
+            'database': os.environ['DATABASE_URL'].split(':', 1)[0],
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed_seconds': round(seed_seconds, 2),
+            'peak_rss_mb': peak_rss_mb(),
+        },
+        'endpoints': results,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Import-time budget check for the app module.
+
+Imports ``app`` in fresh interpreters with ``-X importtime`` and fails when
+the best cumulative import time exceeds the budget, or when any of the heavy
+analytics modules is executed at import. Meant for CI, so a new top-level
+import that undoes the lazy loading is caught before it reaches the workers.
+
+    python check_import_time.py --budget-ms 1000
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'seaborn', 'pyarrow', 'scipy')
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(module):
+    """Return {module name: cumulative microseconds} for one cold import."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"importing {module} failed:\n{result.stderr}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--module', default='app', help='Module to import (default: app)')
+    parser.add_argument('--budget-ms', type=float, default=1000.0,
+                        help='Maximum cumulative import time (default: 1000)')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Imports to run; the fastest is compared (default: 5)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Slowest imports to list (default: 10)')
+    args = parser.parse_args(argv)
+
+    # The fastest run is the least disturbed by a cold disk cache or noisy neighbours
+    runs = [measure(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda timings: timings.get(args.module, 0))
+    total_ms = best.get(args.module, 0) / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, micros in sorted(best.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"over budget by {total_ms - args.budget_ms:.1f} ms")
+    eager = sorted(name for name in best if name.split('.')[0] in HEAVY_MODULES)
+    if eager:
+        top_level = sorted({name.split('.')[0] for name in eager})
+        failures.append(f"heavy modules imported eagerly: {', '.join(top_level)}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
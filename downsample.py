@@ -0,0 +1,43 @@
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+
+def lttb(x, y, threshold):
+    """Downsample a series to ``threshold`` points with Largest-Triangle-Three-Buckets.
+
+    ``x`` must be sorted and numeric (e.g. epoch seconds). Returns the indices
+    of the points to keep, always including the first and last point, so the
+    caller can select labels and values from its own arrays. Thresholds below
+    3 leave no room for interior buckets and keep just the endpoints.
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1], dtype=np.int64)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    # Interior points are split into threshold - 2 equally sized buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        ax, ay = x[selected], y[selected]
+        areas = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        selected = start + int(np.argmax(areas))
+        keep[i + 1] = selected
+    return keep
@@ -0,0 +1,155 @@
+import warnings
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+# Daily forecasts: seasonal naive and additive exponential smoothing with
+# weekly seasonality (Holt-Winters in error-correction form). Fitting works on
+# many series at once: each row of a 2-D array is one series, right-aligned on
+# its last day and NaN-padded on the left, and every step of the smoothing
+# recursion updates all series and all candidate parameters together. A
+# fitted model is a small dict of floats, stored as JSON and forecast from
+# without refitting.
+
+SEASON = 7
+INTERVAL_Z = {80: 1.2816, 95: 1.9600}  # Two-sided normal quantiles by coverage %
+
+# Candidate smoothing parameters; each series keeps the combination with the
+# lowest one-step-ahead squared error
+ALPHAS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.8)  # Level
+BETAS = (0.0, 0.005, 0.02)  # Trend
+GAMMAS = (0.05, 0.1, 0.2, 0.4)  # Season
+
+
+def _parameter_grid():
+    # Keeps the usual stability region: beta <= alpha and gamma <= 1 - alpha
+    grid = [(a, b, g) for a in ALPHAS for b in BETAS for g in GAMMAS if b <= a and g <= 1 - a]
+    return np.array(grid).T
+
+
+def _first_valid(values):
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), values.shape[1])
+
+
+def fit_seasonal_naive(values):
+    """Fit a seasonal naive model to every row of ``values``.
+
+    Each day is forecast as the same weekday one season earlier; sigma is the
+    standard deviation of the in-sample seasonal differences. Series shorter
+    than a season repeat their mean. Returns one model dict per row.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.shape[1] < SEASON:
+        values = np.pad(values, ((0, 0), (SEASON - values.shape[1], 0)), constant_values=np.nan)
+    with warnings.catch_warnings():
+        # The nan-aware reductions warn about rows with nothing to reduce
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(values, axis=1)
+        spread = np.nanstd(values, axis=1)
+        sigma = np.nanstd(values[:, SEASON:] - values[:, :-SEASON], axis=1)
+    last = values[:, -SEASON:]
+    last = np.where(np.isnan(last), np.nan_to_num(mean)[:, None], last)
+    sigma = np.where(np.isnan(sigma), np.nan_to_num(spread), sigma)
+    return [{'method': 'seasonal_naive', 'season': last[row].tolist(), 'sigma': float(sigma[row])}
+            for row in range(len(values))]
+
+
+def fit_ets(values):
+    """Fit additive exponential smoothing with weekly seasonality to every row.
+
+    Rows need at least two seasons of values after their leading NaNs. The
+    first two seasons initialise level, trend and season; the recursion then
+    runs over the rest, for all rows and parameter combinations at once.
+    Returns one model dict per row.
+    """
+    values = np.asarray(values, dtype=float)
+    n_series, length = values.shape
+    first = _first_valid(values)
+    if ((length - first) < 2 * SEASON).any():
+        raise ValueError("Every series needs at least two seasons of history")
+
+    rows = np.arange(n_series)
+    season_one = values[rows[:, None], first[:, None] + np.arange(SEASON)]
+    season_two = values[rows[:, None], first[:, None] + SEASON + np.arange(SEASON)]
+    trend0 = (season_two.mean(axis=1) - season_one.mean(axis=1)) / SEASON
+    # Level at the last day of the first season; the season deviations are
+    # taken around the trend line through the first season's mean
+    offsets = np.arange(SEASON) - (SEASON - 1) / 2
+    level0 = season_one.mean(axis=1) + trend0 * (SEASON - 1) / 2
+    season0 = season_one - (season_one.mean(axis=1)[:, None] + trend0[:, None] * offsets)
+
+    alpha, beta, gamma = _parameter_grid()
+    n_params = len(alpha)
+    level = np.repeat(level0[:, None], n_params, axis=1)
+    trend = np.repeat(trend0[:, None], n_params, axis=1)
+    # Seasonal states are a ring indexed by absolute step modulo SEASON, so one
+    # index serves every row whatever its start
+    season = np.empty((n_series, n_params, SEASON))
+    for i in range(SEASON):
+        season[rows, :, (first + i) % SEASON] = season0[:, i][:, None]
+    sse = np.zeros((n_series, n_params))
+    steps = np.zeros(n_series)
+
+    for t in range(int(first.min()) + SEASON, length):
+        active = (t >= first + SEASON)[:, None]
+        slot = t % SEASON
+        error = values[:, t, None] - (level + trend + season[:, :, slot])
+        # Rows that have not started yet keep their initial states
+        error = np.where(active, error, 0.0)
+        level = np.where(active, level + trend + alpha * error, level)
+        trend = trend + beta * error
+        season[:, :, slot] += gamma * error
+        sse += error ** 2
+        steps += active[:, 0]
+
+    best = sse.argmin(axis=1)
+    sigma = np.sqrt(sse[rows, best] / np.maximum(steps, 1))
+    # Seasonal states in the order of the days being forecast
+    upcoming = season[rows, best][:, (length + np.arange(SEASON)) % SEASON]
+    return [{
+        'method': 'ets',
+        'alpha': float(alpha[best[row]]),
+        'beta': float(beta[best[row]]),
+        'gamma': float(gamma[best[row]]),
+        'level': float(level[row, best[row]]),
+        'trend': float(trend[row, best[row]]),
+        'season': upcoming[row].tolist(),
+        'sigma': float(sigma[row]),
+    } for row in range(n_series)]
+
+
+def fit_models(values):
+    """Fit every method that the history allows; one {method: model} dict per row."""
+    values = np.asarray(values, dtype=float)
+    models = [{'seasonal_naive': model} for model in fit_seasonal_naive(values)]
+    long_enough = (values.shape[1] - _first_valid(values)) >= 2 * SEASON
+    if long_enough.any():
+        for row, model in zip(np.flatnonzero(long_enough), fit_ets(values[long_enough])):
+            models[row]['ets'] = model
+    return models
+
+
+def forecast(model, horizon):
+    """Point forecasts and their standard errors for the next ``horizon`` days.
+
+    Returns (values, std) arrays. ETS errors grow with the usual
+    state-space variance; seasonal naive ones with each season looked back.
+    """
+    h = np.arange(1, horizon + 1)
+    season = np.asarray(model['season'])[(h - 1) % SEASON]
+    if model['method'] == 'ets':
+        values = model['level'] + h * model['trend'] + season
+        j = np.arange(1, horizon)
+        weights = model['alpha'] + model['beta'] * j + model['gamma'] * (j % SEASON == 0)
+        variance = 1 + np.concatenate([[0.0], np.cumsum(weights ** 2)])
+    else:
+        values = season
+        variance = 1 + (h - 1) // SEASON
+    return values, model['sigma'] * np.sqrt(variance)
+
+
+def intervals(values, std):
+    """Prediction intervals as {coverage %: (lower, upper)}, assuming normal errors."""
+    return {level: (values - z * std, values + z * std) for level, z in INTERVAL_Z.items()}
@@ -0,0 +1,53 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+# Held while a lazily imported module is first loaded. importlib's LazyLoader
+# is not thread-safe before Python 3.12: it marks the module loaded before
+# executing it, so threads racing on first use see a half-initialised module.
+_load_lock = threading.RLock()
+
+
+class _LazyModule(types.ModuleType):
+    """Placeholder that imports the real module when a missing attribute is read.
+
+    Before the import nothing but the module metadata is set, so every lookup
+    ends up here and waits on the lock. Afterwards the real module's namespace
+    is copied in and lookups no longer pass through this method.
+    """
+
+    def __getattr__(self, attr):
+        return getattr(_load(self), attr)
+
+
+def _load(placeholder):
+    with _load_lock:
+        module = importlib.import_module(placeholder.__name__)
+        if placeholder.__dict__.get('__spec__') is not module.__spec__:
+            placeholder.__dict__.update(module.__dict__)
+    return module
+
+
+def lazy_import(name):
+    """Return module ``name`` without executing it until an attribute is used.
+
+    Keeps heavy libraries (pandas, numpy) off the startup path of workers and
+    CLI commands that never touch them. Returns None if the module is not
+    installed. Only for top-level modules: finding a submodule imports its
+    parent package. Safe to use from several threads at once.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    return _LazyModule(name)
+
+
+def ensure_loaded(*modules):
+    """Execute lazily imported modules now, e.g. before forking workers."""
+    for module in modules:
+        if isinstance(module, _LazyModule):
+            _load(module)
@@ -0,0 +1,151 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Timing spans and a small Prometheus registry. Spans recorded while a
+# request is active are also collected per request, for the Server-Timing
+# header; outside a request (job workers, the render pool) they only feed the
+# registry of the current process.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_request_spans = contextvars.ContextVar('request_spans', default=None)
+
+
+class Registry:
+    """Thread-safe counters and histograms rendered in Prometheus text format."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self, gauges=()):
+        """Prometheus exposition text, plus ``gauges`` as (name, labels dict, value) tuples."""
+        lines = []
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(b), s, c) for key, (b, s, c) in self._histograms.items()}
+
+        for name in sorted({key[0] for key in counters}):
+            self._header(lines, name, 'counter')
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+
+        for name in sorted({key[0] for key in histograms}):
+            self._header(lines, name, 'histogram')
+            for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, cumulative in zip(self.buckets, buckets):
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{_labels(labels)} {total}")
+                lines.append(f"{name}_count{_labels(labels)} {count}")
+
+        by_name = {}
+        for name, labels, value in gauges:
+            by_name.setdefault(name, []).append((labels, value))
+        for name in sorted(by_name):
+            self._header(lines, name, 'gauge')
+            for labels, value in by_name[name]:
+                lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def _header(self, lines, name, kind):
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+registry = Registry()
+registry.describe('app_span_seconds', 'Time spent in instrumented sections of request handling.')
+
+
+def begin_request():
+    """Start collecting spans for the current request; returns a token for end_request()."""
+    return _request_spans.set({})
+
+
+def current_spans():
+    """{span name: [seconds, count]} collected so far in the current request."""
+    return _request_spans.get() or {}
+
+
+def end_request(token):
+    _request_spans.reset(token)
+
+
+def record(name, seconds):
+    spans = _request_spans.get()
+    if spans is not None:
+        entry = spans.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    registry.observe('app_span_seconds', seconds, span=name)
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block as ``name``. Spans may nest; each is timed separately."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing(spans, total=None):
+    """Format collected spans as a Server-Timing header value."""
+    parts = []
+    for name, (seconds, count) in spans.items():
+        part = f"{name};dur={seconds * 1000:.1f}"
+        if count > 1:
+            part += f';desc="{count}x"'
+        parts.append(part)
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(parts)
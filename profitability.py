@@ -0,0 +1,82 @@
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Menu profitability: margins per item and category, discount leakage and
+# items bought together. Plain DataFrame functions; app.menu_profitability
+# feeds them from the daily rollups, but they work on raw SaleItem rows too.
+
+ITEM_COLUMNS = ['menu_item_id', 'name', 'category', 'quantity', 'gross', 'discount',
+                'revenue', 'cost', 'gross_margin', 'margin_pct', 'discount_rate']
+SUM_COLUMNS = ['quantity', 'gross', 'discount', 'revenue', 'cost', 'gross_margin']
+
+
+def _ratio(numerator, denominator):
+    # 0 rather than NaN or inf where nothing was sold
+    return (numerator / denominator.where(denominator != 0)).fillna(0.0)
+
+
+def item_pairs(items):
+    """Every pair of different menu items sold together, one row per sale and pair.
+
+    ``items`` has sale_id, menu_item_id and date columns, one row per sale
+    line. Returns sale_id, date and key columns, where key is
+    "<id>:<id>" with the lower id first.
+    """
+    lines = items.drop_duplicates(['sale_id', 'menu_item_id'])
+    # Only sales with at least two distinct items can form a pair
+    lines = lines[lines.duplicated('sale_id', keep=False)]
+    pairs = lines.merge(lines[['sale_id', 'menu_item_id']], on='sale_id', suffixes=('_a', '_b'))
+    pairs = pairs[pairs['menu_item_id_a'] < pairs['menu_item_id_b']]
+    return pd.DataFrame({
+        'sale_id': pairs['sale_id'].to_numpy(),
+        'date': pd.to_datetime(pairs['date']).to_numpy(),
+        'key': (pairs['menu_item_id_a'].astype(str) + ':' + pairs['menu_item_id_b'].astype(str)).to_numpy(),
+    })
+
+
+def item_margins(totals, menu):
+    """Revenue, cost and gross margin per menu item, best margin first.
+
+    ``totals`` has menu_item_id, quantity, gross (quantity x price at sale)
+    and discount columns; ``menu`` has id, name, category and unit_cost.
+    Revenue is gross less discounts; discount_rate is the share of gross
+    given away. Items missing from ``menu`` are costed at zero.
+    """
+    frame = totals.merge(menu, left_on='menu_item_id', right_on='id', how='left')
+    frame['name'] = frame['name'].fillna(frame['menu_item_id'].astype(str))
+    frame['category'] = frame['category'].fillna('Unknown')
+    frame['revenue'] = frame['gross'] - frame['discount']
+    frame['cost'] = frame['quantity'] * frame['unit_cost'].fillna(0.0)
+    frame['gross_margin'] = frame['revenue'] - frame['cost']
+    frame['margin_pct'] = _ratio(frame['gross_margin'], frame['revenue'])
+    frame['discount_rate'] = _ratio(frame['discount'], frame['gross'])
+    return frame[ITEM_COLUMNS].sort_values('gross_margin', ascending=False, ignore_index=True)
+
+
+def category_margins(items):
+    """Roll the output of item_margins() up to menu categories."""
+    frame = items.groupby('category', sort=False)[SUM_COLUMNS].sum().reset_index()
+    frame['margin_pct'] = _ratio(frame['gross_margin'], frame['revenue'])
+    frame['discount_rate'] = _ratio(frame['discount'], frame['gross'])
+    return frame.sort_values('gross_margin', ascending=False, ignore_index=True)
+
+
+def pair_affinity(pairs, sales, item_sales):
+    """Support and lift of item pairs.
+
+    ``pairs`` has key and count (sales containing both items), ``sales`` is
+    the number of sales and ``item_sales`` maps a menu item id to the number
+    of sales containing it. Lift above 1 means the two sell together more
+    often than their individual popularity would predict.
+    """
+    columns = ['item_a', 'item_b', 'count', 'support', 'lift']
+    if pairs.empty or not sales:
+        return pd.DataFrame(columns=columns)
+    ids = pairs['key'].str.split(':', expand=True).astype(np.int64)
+    frame = pd.DataFrame({'item_a': ids[0], 'item_b': ids[1], 'count': pairs['count']})
+    expected = frame['item_a'].map(item_sales).astype(float) * frame['item_b'].map(item_sales) / sales
+    frame['support'] = frame['count'] / sales
+    frame['lift'] = _ratio(frame['count'].astype(float), expected)
+    return frame[columns].sort_values('count', ascending=False, ignore_index=True)
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryBucketStore:
+    """Token buckets held in this process's memory.
+
+    The default store for RateLimiter. Buckets are kept in an LRU bounded by
+    ``max_keys``; a bucket evicted while idle has refilled anyway, so
+    eviction only forgets clients that have stopped sending. Any object with
+    the same ``take`` method can replace it, e.g. one backed by a store
+    shared between processes.
+    """
+
+    def __init__(self, max_keys=100_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()  # key -> (tokens, last refill time)
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost=1.0):
+        """Take ``cost`` tokens from bucket ``key`` if it has them.
+
+        Buckets start full with ``capacity`` tokens and refill at ``rate``
+        tokens per second. Returns 0 when the tokens were taken, otherwise the
+        seconds until they would be available; nothing is taken then.
+        """
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RateLimiter:
+    """Token-bucket limits on named keys, e.g. one bucket per client IP.
+
+    ``limits`` maps a scope to (capacity, tokens per second). ``hit`` charges
+    one request to a bucket in each of the given scopes; the request is
+    allowed only if every bucket had a token.
+    """
+
+    def __init__(self, limits, store=None):
+        self.limits = limits
+        self.store = store if store is not None else MemoryBucketStore()
+
+    def hit(self, **keys):
+        """Charge a request to ``scope=key`` buckets; returns seconds to wait, 0 if allowed.
+
+        Scopes are charged in order and a rejected scope stops the rest, so
+        requests refused by the first limit do not drain the later ones.
+        """
+        for scope, key in keys.items():
+            capacity, rate = self.limits[scope]
+            wait = self.store.take(f"{scope}:{key}", capacity, rate)
+            if wait:
+                return wait
+        return 0.0
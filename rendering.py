@@ -0,0 +1,233 @@
+from contextlib import contextmanager
+from datetime import datetime
+from io import BytesIO
+
+from lazy_import import lazy_import
+from metrics import span
+
+pd = lazy_import('pandas')
+sns = lazy_import('seaborn')
+
+# All server-side charts are drawn here. Renderers build standalone Figure
+# objects rather than going through pyplot, so they keep no global state and
+# are safe to run concurrently in threads or worker processes. Each takes the
+# plain data returned by chart_series() and returns encoded image bytes, or
+# b'' when there is nothing to draw.
+#
+# matplotlib is only imported when the first chart is drawn, so processes
+# that never render do not pay for it.
+
+STYLE = {
+    'figure.dpi': 100,
+    'savefig.dpi': 100,
+    'axes.titlesize': 13,
+    'axes.labelsize': 11,
+    'font.size': 10,
+    'path.simplify': True,
+    'agg.path.chunksize': 10000,
+}
+_Figure = None
+
+
+def _figure_class():
+    global _Figure
+    if _Figure is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Must come before anything (seaborn) imports pyplot
+        matplotlib.rcParams.update(STYLE)  # Applied once instead of on every chart
+        from matplotlib.figure import Figure
+        _Figure = Figure
+    return _Figure
+
+
+FORMATS = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+}
+LOW_COST_DPI = 60
+
+
+@contextmanager
+def _figure(figsize):
+    # Clearing on exit releases the artists even if rendering raised
+    with span('render'):
+        fig = _figure_class()(figsize=figsize)
+        try:
+            yield fig
+        finally:
+            fig.clear()
+
+
+def _encode(fig, fmt='png', low_cost=False, tight_bbox=False):
+    """Encode a finished figure.
+
+    Low-cost mode trades quality for speed: reduced DPI and no layout passes
+    (``tight_layout`` / ``bbox_inches='tight'`` both re-measure every artist).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported image format: {fmt}")
+    kwargs = {'format': fmt}
+    if low_cost:
+        kwargs['dpi'] = LOW_COST_DPI
+    else:
+        fig.tight_layout()
+        if tight_bbox:
+            kwargs['bbox_inches'] = 'tight'
+
+    buf = BytesIO()
+    with span('encode'):
+        fig.savefig(buf, **kwargs)
+    return buf.getvalue()
+
+
+def _dates(labels):
+    return [datetime.fromisoformat(label) for label in labels]
+
+
+def _plot_forecast(ax, forecast):
+    # Dashed forecast line after the history, with its 95% and 80% intervals shaded
+    if not forecast or not forecast['values']:
+        return
+    dates = _dates(forecast['labels'])
+    for level, alpha in (('95', 0.15), ('80', 0.25)):
+        band = forecast['intervals'].get(level)
+        if band:
+            ax.fill_between(dates, band['lower'], band['upper'], color='tab:orange', alpha=alpha,
+                            linewidth=0, label=f'{level}% interval')
+    ax.plot(dates, forecast['values'], color='tab:orange', linestyle='--', linewidth=2, label='Forecast')
+    ax.legend(loc='upper left')
+
+
+# Report charts (restaurant sales)
+
+def render_revenue(data, fmt='png', low_cost=False):
+    if not data['values']:
+        return b''
+    with _figure((10, 6)) as fig:
+        ax = fig.subplots()
+        ax.plot(_dates(data['labels']), data['values'], 'b-', linewidth=2)
+        _plot_forecast(ax, data.get('forecast'))
+        ax.set_title('Revenue Trend', pad=20)
+        ax.set_ylabel('Amount (₦)', labelpad=10)
+        ax.set_xlabel('Date', labelpad=10)
+        ax.grid(True, linestyle='--', alpha=0.6)
+        ax.tick_params(axis='x', labelrotation=45)
+        return _encode(fig, fmt, low_cost)
+
+
+def render_top_items(data, fmt='png', low_cost=False):
+    if not data['values']:
+        return b''
+    with _figure((10, 6)) as fig:
+        ax = fig.subplots()
+        bars = ax.barh([str(label) for label in data['labels']], data['values'], color='#3498db')
+        ax.set_title('Top Selling Menu Items', pad=20)
+        ax.set_xlabel('Quantity Sold', labelpad=10)
+        ax.grid(True, axis='x', linestyle='--', alpha=0.6)
+
+        # Add value labels
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width + 0.3, bar.get_y() + bar.get_height()/2,
+                    f'{int(width)}',
+                    ha='left', va='center')
+        return _encode(fig, fmt, low_cost)
+
+
+def render_heatmap(data, fmt='png', low_cost=False):
+    if not data['hours']:
+        return b''
+    heatmap_data = pd.DataFrame(data['values'], index=data['hours'], columns=data['days'])
+    with _figure((12, 8)) as fig:
+        ax = fig.subplots()
+        sns.heatmap(heatmap_data, cmap='YlGnBu', ax=ax,
+                    annot=not low_cost, fmt='.0f', linewidths=.5)
+        ax.set_title('Sales Heatmap (Hour vs Day)', pad=20)
+        ax.set_xlabel('Day of Week', labelpad=10)
+        ax.set_ylabel('Hour of Day', labelpad=10)
+        return _encode(fig, fmt, low_cost)
+
+
+def render_payment_methods(data, fmt='png', low_cost=False):
+    if not data['values']:
+        return b''
+    with _figure((8, 8)) as fig:
+        ax = fig.subplots()
+        wedges, texts, autotexts = ax.pie(
+            data['values'], labels=data['labels'], autopct='%1.1f%%',
+            startangle=90, wedgeprops={'width': 0.4},
+            textprops={'fontsize': 10}, pctdistance=0.85,
+            colors=['#3498db', '#2ecc71', '#e74c3c', '#f39c12']
+        )
+
+        # Equal aspect ratio ensures pie is drawn as circle
+        ax.axis('equal')
+        ax.set_title('Payment Method Distribution', pad=20)
+
+        # Make percentage text white and bold
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_weight('bold')
+        return _encode(fig, fmt, low_cost)
+
+
+REPORT_RENDERERS = {
+    'revenue': render_revenue,
+    'top-items': render_top_items,
+    'heatmap': render_heatmap,
+    'payment-methods': render_payment_methods,
+}
+
+
+def render_report_chart(chart_id, data, fmt='png', low_cost=False):
+    """Render one report chart; top-level so it can be sent to a process pool."""
+    return REPORT_RENDERERS[chart_id](data, fmt, low_cost)
+
+
+# Dashboard charts (transactions)
+
+def render_overview(data, fmt='png', low_cost=False):
+    with _figure((10, 6)) as fig:
+        ax = fig.subplots()
+        if data['values']:
+            ax.plot(_dates(data['labels']), data['values'], 'b-')
+            ax.set_title('Your Transactions')
+        else:
+            ax.text(0.5, 0.5, 'No transactions found\nUpload data to visualize',
+                    ha='center', va='center')
+            ax.set_title('No Data Available')
+
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Amount')
+        ax.tick_params(axis='x', labelrotation=45)
+        return _encode(fig, fmt, low_cost)
+
+
+def render_visualization_chart(chart_id, data, fmt='png', low_cost=False):
+    """Render a /visualize chart; unknown chart ids give empty axes."""
+    with _figure((10, 6)) as fig:
+        ax = fig.subplots()
+        if chart_id == 'revenue':
+            ax.plot(_dates(data['labels']), data['values'], 'b-')
+            _plot_forecast(ax, data.get('forecast'))
+            ax.set_title('Revenue Trend')
+
+        elif chart_id == 'top-items':
+            if data['values']:
+                ax.bar([str(label) for label in data['labels']], data['values'])
+                ax.set_title('Top Categories by Spending')
+
+        elif chart_id == 'heatmap':
+            heatmap_data = pd.DataFrame(data['values'], index=data['hours'], columns=data['days'])
+            sns.heatmap(heatmap_data, ax=ax, cmap='YlGnBu')
+            ax.set_title('Transaction Heatmap (Hour vs Day)')
+
+        elif chart_id == 'payment-methods':
+            if data['values']:
+                ax.pie(data['values'], labels=data['labels'], autopct='%1.1f%%')
+                ax.set_title('Payment Distribution by Recipient')
+
+        ax.set_xlabel('')
+        ax.set_ylabel('')
+        return _encode(fig, fmt, low_cost, tight_bbox=True)
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import uuid
+
+from lazy_import import lazy_import
+
+pa = lazy_import('pyarrow')  # Optional; without it the store is disabled
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; fall back to the thread lock
+    fcntl = None
+
+SNAPSHOT_COLUMNS = ['date', 'amount', 'category', 'recipient', 'is_anomaly']
+
+
+def snapshot_schema():
+    # Fixed so segments written from different batches can always be concatenated
+    return pa.schema([
+        ('date', pa.timestamp('us')),
+        ('amount', pa.float64()),
+        ('category', pa.string()),
+        ('recipient', pa.string()),
+        ('is_anomaly', pa.bool_()),
+    ])
+
+
+class SnapshotStore:
+    """Per-user columnar snapshots of transaction data, stored as Arrow IPC.
+
+    Each user directory holds uncompressed Arrow segments plus a manifest
+    recording the data version they reflect. Ingest appends one segment per
+    batch; reads memory-map the segments, so numeric columns reach pandas
+    without a copy and without touching the database. A snapshot whose
+    version does not match the caller's is ignored and can be rewritten.
+
+    Requires pyarrow; when it is missing ``enabled`` is False, ``load``
+    returns None and writes are no-ops, so callers fall back to SQL.
+    """
+
+    def __init__(self, root, max_segments=16):
+        self.root = root
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return pa is not None
+
+    def load(self, user_id, version, columns=None):
+        """Return the snapshot as a DataFrame, or None if missing or stale."""
+        if not self.enabled:
+            return None
+        manifest = self._read_manifest(user_id)
+        if manifest is None or manifest['version'] != version:
+            return None
+        try:
+            tables = [self._read_segment(user_id, name, columns) for name in manifest['segments']]
+        except (OSError, pa.ArrowInvalid):
+            return None
+        if not tables:
+            return None
+        table = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+        return table.to_pandas()
+
+    def write(self, user_id, version, frame):
+        """Replace a user's snapshot with ``frame`` at ``version``.
+
+        ``frame`` must have the SNAPSHOT_COLUMNS; other columns are dropped.
+        """
+        if not self.enabled:
+            return
+        with self._user_lock(user_id):
+            old = self._read_manifest(user_id)
+            segment = self._write_segment(user_id, frame)
+            self._write_manifest(user_id, {'version': version, 'segments': [segment]})
+            if old is not None:
+                self._remove_segments(user_id, old['segments'])
+
+    def append(self, user_id, base_version, version, frame):
+        """Add ``frame`` to a snapshot that is exactly at ``base_version``.
+
+        Returns False without writing when the snapshot is missing or at any
+        other version; the next read then rebuilds it.
+        """
+        if not self.enabled:
+            return False
+        with self._user_lock(user_id):
+            manifest = self._read_manifest(user_id)
+            if manifest is None or manifest['version'] != base_version:
+                return False
+            segments = manifest['segments'] + [self._write_segment(user_id, frame)]
+            if len(segments) > self.max_segments:
+                # Fold the segments back into one so reads stay single-chunk
+                merged = pa.concat_tables([self._read_segment(user_id, name) for name in segments])
+                compacted = self._write_segment(user_id, merged)
+                self._write_manifest(user_id, {'version': version, 'segments': [compacted]})
+                self._remove_segments(user_id, segments)
+            else:
+                self._write_manifest(user_id, {'version': version, 'segments': segments})
+            return True
+
+    def discard(self, user_id):
+        manifest = self._read_manifest(user_id)
+        if manifest is None:
+            return
+        with self._user_lock(user_id):
+            try:
+                os.remove(self._path(user_id, 'manifest.json'))
+            except OSError:
+                pass
+            self._remove_segments(user_id, manifest['segments'])
+
+    def _path(self, user_id, name):
+        return os.path.join(self.root, str(user_id), name)
+
+    def _user_lock(self, user_id):
+        os.makedirs(os.path.join(self.root, str(user_id)), exist_ok=True)
+        return _FileLock(self._path(user_id, '.lock'), self._lock)
+
+    def _read_manifest(self, user_id):
+        try:
+            with open(self._path(user_id, 'manifest.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, user_id, manifest):
+        path = self._path(user_id, 'manifest.json')
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def _read_segment(self, user_id, name, columns=None):
+        source = pa.memory_map(self._path(user_id, name), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+
+    def _write_segment(self, user_id, data):
+        table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(
+            data[SNAPSHOT_COLUMNS], schema=snapshot_schema(), preserve_index=False)
+        name = f"{uuid.uuid4().hex}.arrow"
+        path = self._path(user_id, name)
+        with pa.OSFile(f"{path}.tmp", 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(f"{path}.tmp", path)
+        return name
+
+    def _remove_segments(self, user_id, names):
+        for name in names:
+            try:
+                os.remove(self._path(user_id, name))
+            except OSError:
+                pass  # Still mapped by a reader on some platforms; harmless
+
+
+class _FileLock:
+    # Serializes snapshot writers across threads and, where fcntl exists, processes
+    def __init__(self, path, thread_lock):
+        self.path = path
+        self.thread_lock = thread_lock
+        self._file = None
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        if fcntl is not None:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self.thread_lock.release()
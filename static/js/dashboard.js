@@ -29,6 +29,42 @@ const CHART_CONFIG = {
 // Chart instances storage
 const chartInstances = {};
 
+// Bodies of recent GET responses with their validators, so repeated requests
+// can be revalidated and answered with 304 Not Modified
+const responseCache = new Map();
+const RESPONSE_CACHE_SIZE = 50;
+
+// fetch() for JSON GET endpoints that support conditional requests. A 304 is
+// turned back into a normal response carrying the cached body.
+async function cachedFetch(url) {
+    const cached = responseCache.get(url);
+    const headers = {};
+    if (cached) {
+        if (cached.etag) headers['If-None-Match'] = cached.etag;
+        if (cached.lastModified) headers['If-Modified-Since'] = cached.lastModified;
+    }
+
+    const response = await fetch(url, { headers });
+    if (response.status === 304 && cached) {
+        // Re-insert so the entry counts as recently used
+        responseCache.delete(url);
+        responseCache.set(url, cached);
+        return { ok: true, status: 200, json: async () => cached.data };
+    }
+
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    const lastModified = response.headers.get('Last-Modified');
+    if (response.ok && (etag || lastModified)) {
+        responseCache.delete(url);
+        responseCache.set(url, { etag, lastModified, data });
+        if (responseCache.size > RESPONSE_CACHE_SIZE) {
+            responseCache.delete(responseCache.keys().next().value);
+        }
+    }
+    return { ok: response.ok, status: response.status, json: async () => data };
+}
+
 // Dashboard functionality
 document.addEventListener('DOMContentLoaded', function() {
     initDashboard();
@@ -48,7 +84,7 @@ const MENU_ITEMS = {
 };
 
 // Improved loadChart function
-async function loadChart(chartId, chartType, timePeriod = 'day') {
+async function loadChart(chartId, chartType, timePeriod = 'auto') {
     try {
         const config = CHART_CONFIG[chartId];
         if (!config) {
@@ -71,17 +107,12 @@ async function loadChart(chartId, chartType, timePeriod = 'day') {
         `;
 
         // Fetch chart data from server
-        const response = await fetch('/visualize', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                chart_type: chartType,
-                chart_id: chartId,
-                time_period: timePeriod
-            })
+        const params = new URLSearchParams({
+            chart_type: chartType,
+            chart_id: chartId,
+            time_period: timePeriod
         });
+        const response = await cachedFetch(`/visualize?${params}`);
 
         const data = await response.json();
 
@@ -137,7 +168,7 @@ async function loadChart(chartId, chartType, timePeriod = 'day') {
 async function updateKPIs() {
     try {
         // Fetch data from server
-        const response = await fetch('/dashboard-data');
+        const response = await cachedFetch('/dashboard-data?include_plot=0');
         const data = await response.json();
         
         if (!response.ok) {
@@ -209,7 +240,7 @@ async function downloadDashboardReport() {
         showMessage('#visualize-section', 'Generating PDF report...', 'info');
         
         // Fetch the current dashboard data
-        const dashboardResponse = await fetch('/dashboard-data');
+        const dashboardResponse = await cachedFetch('/dashboard-data');
         const dashboardData = await dashboardResponse.json();
         
         if (!dashboardResponse.ok) {
@@ -428,6 +459,29 @@ function setupEventListeners() {
     if (timePeriodSelect) {
         timePeriodSelect.addEventListener('change', loadVisualizationData);
     }
+
+    // Forecast overlay on the revenue chart
+    const forecastToggle = document.getElementById('show-forecast');
+    if (forecastToggle) {
+        forecastToggle.addEventListener('change', () => {
+            const timePeriod = document.getElementById('time-period')?.value || 'auto';
+            loadChart('revenue', 'line', timePeriod);
+        });
+    }
+
+    // Transaction list filters and paging
+    const filterForm = document.getElementById('transaction-filters');
+    if (filterForm) {
+        filterForm.addEventListener('submit', e => {
+            e.preventDefault();
+            loadTransactions(true);
+        });
+    }
+
+    const loadMoreBtn = document.getElementById('load-more-transactions');
+    if (loadMoreBtn) {
+        loadMoreBtn.addEventListener('click', () => loadTransactions(false));
+    }
 }
 
 // Prevent default drag and drop behaviors
@@ -470,8 +524,13 @@ async function handleFileUpload(e) {
         return;
     }
     
+    const uploadId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
     const formData = new FormData();
     formData.append('file', fileInput.files[0]);
+    formData.append('upload_id', uploadId);
+    
+    // Poll ingestion progress while the upload request is in flight
+    const stopPolling = pollUploadProgress(uploadId, statusDiv);
     
     try {
         showMessage(statusDiv, 'Uploading file...', 'info');
@@ -481,10 +540,12 @@ async function handleFileUpload(e) {
             body: formData
         });
         
+        stopPolling();
         const data = await response.json();
         
         if (response.ok) {
-            showMessage(statusDiv, 'File uploaded successfully! Processing data...', 'success');
+            const report = data.report || {};
+            showMessage(statusDiv, `File uploaded successfully! ${report.rows_accepted ?? 0} rows imported, ${report.rows_rejected ?? 0} rejected. Processing data...`, 'success');
             
             // Process the uploaded data
             await processUploadedData();
@@ -507,15 +568,41 @@ async function handleFileUpload(e) {
             showMessage(statusDiv, data.error || 'Error uploading file', 'error');
         }
     } catch (error) {
+        stopPolling();
         showMessage(statusDiv, 'Error uploading file: ' + error.message, 'error');
     }
 }
 
+// Poll /upload-progress for a streaming upload; returns a function that stops polling
+function pollUploadProgress(uploadId, statusDiv, interval = 1000) {
+    let stopped = false;
+    
+    const poll = async () => {
+        if (stopped) return;
+        try {
+            const response = await fetch(`/upload-progress/${encodeURIComponent(uploadId)}`);
+            if (response.ok && !stopped) {
+                const progress = await response.json();
+                if (progress.status === 'processing') {
+                    const percent = progress.percent != null ? ` (${progress.percent}%)` : '';
+                    showMessage(statusDiv, `Processing... ${progress.rows_processed} rows${percent}`, 'info');
+                }
+            }
+        } catch (error) {
+            console.error('Error polling upload progress:', error);
+        }
+        if (!stopped) setTimeout(poll, interval);
+    };
+    setTimeout(poll, interval);
+    
+    return () => { stopped = true; };
+}
+
 // Process uploaded data
 async function processUploadedData() {
     try {
         // Detect anomalies in the uploaded data
-        const response = await fetch('/dashboard-data');
+        const response = await cachedFetch('/dashboard-data?include_plot=0');
         const data = await response.json();
         
         if (!response.ok) {
@@ -529,12 +616,77 @@ async function processUploadedData() {
     }
 }
 
+// Draw the transaction overview from downsampled points
+async function drawOverviewChart() {
+    const canvas = document.getElementById('overview-chart');
+    if (!canvas) return;
+    
+    const response = await cachedFetch('/api/charts/overview');
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.error || 'Error loading overview chart');
+    }
+    
+    if (chartInstances.overview) {
+        chartInstances.overview.destroy();
+    }
+    chartInstances.overview = renderChartData(canvas, data, 'Your Transactions');
+}
+
+// Fetch a page of transactions; reset starts over with the current filters
+async function loadTransactions(reset = false) {
+    const tableBody = document.getElementById('transactions-body');
+    const loadMoreBtn = document.getElementById('load-more-transactions');
+    const filterForm = document.getElementById('transaction-filters');
+    if (!tableBody || !loadMoreBtn) return;
+
+    const params = new URLSearchParams();
+    if (filterForm) {
+        new FormData(filterForm).forEach((value, key) => {
+            if (value) params.set(key, value);
+        });
+    }
+    if (!reset && loadMoreBtn.dataset.cursor) {
+        params.set('cursor', loadMoreBtn.dataset.cursor);
+    }
+
+    try {
+        const response = await fetch(`/api/transactions?${params}`);
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error || 'Error loading transactions');
+        }
+
+        if (reset) tableBody.innerHTML = '';
+        data.transactions.forEach(t => {
+            const row = document.createElement('tr');
+            if (t.is_anomaly) row.classList.add('anomaly');
+            [t.date.slice(0, 10), `₦${t.amount.toFixed(2)}`, t.category || '', t.recipient || '', t.description || '']
+                .forEach(value => {
+                    const cell = document.createElement('td');
+                    cell.textContent = value;
+                    row.appendChild(cell);
+                });
+            tableBody.appendChild(row);
+        });
+        if (reset && !data.transactions.length) {
+            tableBody.innerHTML = '<tr><td colspan="5">No transactions found</td></tr>';
+        }
+
+        loadMoreBtn.dataset.cursor = data.next_cursor || '';
+        loadMoreBtn.hidden = !data.next_cursor;
+    } catch (error) {
+        console.error('Error loading transactions:', error);
+        tableBody.innerHTML = `<tr><td colspan="5">Error loading data: ${error.message}</td></tr>`;
+    }
+}
+
 // Load dashboard data
 async function loadDashboardData() {
     try {
         showLoading('#dashboard-section .chart-container');
         
-        const response = await fetch('/dashboard-data');
+        const response = await cachedFetch('/dashboard-data?include_plot=0');
         const data = await response.json();
         
         if (!response.ok) {
@@ -546,16 +698,11 @@ async function loadDashboardData() {
         document.getElementById('total-amount').textContent = `₦${data.total_amount.toFixed(2)}`;
         document.getElementById('anomalies-count').textContent = data.anomaly_count;
         
-        // Update chart
-        const chartImg = document.querySelector('#dashboard-section .chart-image');
-        if (chartImg) {
-            chartImg.src = `data:image/png;base64,${data.plot_data}`;
-            chartImg.onload = () => {
-                // Hide loading spinner when image is loaded
-                const loadingSpinner = document.querySelector('#dashboard-section .loading-spinner');
-                if (loadingSpinner) loadingSpinner.style.display = 'none';
-            };
-        }
+        // Update chart and the first page of the transaction list
+        await drawOverviewChart();
+        await loadTransactions(true);
+        const loadingSpinner = document.querySelector('#dashboard-section .loading-spinner');
+        if (loadingSpinner) loadingSpinner.style.display = 'none';
         
     } catch (error) {
         console.error('Error loading dashboard data:', error);
@@ -572,7 +719,7 @@ async function loadVisualizationData() {
         showAllChartsLoading();
         
         // Get selected time period
-        const timePeriod = document.getElementById('time-period')?.value || 'day';
+        const timePeriod = document.getElementById('time-period')?.value || 'auto';
         
         // Load data for each chart
         await Promise.all([
@@ -597,7 +744,7 @@ async function loadVisualizationData() {
 }
 
 // Load a specific chart
-async function loadChart(chartId, chartType, timePeriod = 'day') {
+async function loadChart(chartId, chartType, timePeriod = 'auto') {
     try {
         const container = document.getElementById(`${chartId}-chart`);
         if (!container) return;
@@ -610,18 +757,13 @@ async function loadChart(chartId, chartType, timePeriod = 'day') {
             </div>
         `;
 
-        const response = await fetch('/visualize', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                chart_type: chartType,
-                time_period: timePeriod,
-                chart_id: chartId,
-                dashboard_view: true
-            })
+        const params = new URLSearchParams({
+            chart_type: chartType,
+            time_period: timePeriod,
+            chart_id: chartId,
+            dashboard_view: true
         });
+        const response = await cachedFetch(`/visualize?${params}`);
 
         const data = await response.json();
 
@@ -694,35 +836,30 @@ async function updateMenuPerformanceTable() {
         const tableBody = document.getElementById('menu-performance-body');
         if (!tableBody) return;
         
-        // Fetch data from server
-        const response = await fetch('/dashboard-data');
+        // Per-item margins, computed server-side from the daily sales rollups
+        const response = await cachedFetch('/api/menu-profitability');
         const data = await response.json();
         
         if (!response.ok) {
-            throw new Error(data.error || 'Error fetching dashboard data');
+            throw new Error(data.error || 'Error fetching menu profitability');
         }
 
         // Clear existing rows
         tableBody.innerHTML = '';
         
-        // Group transactions by category
-        const categories = {};
-        data.transactions.forEach(t => {
-            const category = t.category || 'Uncategorized';
-            categories[category] = categories[category] || { amount: 0, count: 0 };
-            categories[category].amount += t.amount;
-            categories[category].count++;
-        });
-        
-        // Add rows to table
-        Object.entries(categories).forEach(([category, stats]) => {
+        if (data.items.length === 0) {
+            tableBody.innerHTML = '<tr><td colspan="5">No sales recorded yet</td></tr>';
+            return;
+        }
+
+        data.items.forEach(item => {
             const row = document.createElement('tr');
             row.innerHTML = `
-                <td>${category}</td>
-                <td>${category}</td>
-                <td>${stats.count}</td>
-                <td>₦${stats.amount.toFixed(2)}</td>
-                <td>N/A</td>
+                <td>${item.name}</td>
+                <td>${item.category}</td>
+                <td>${item.quantity}</td>
+                <td>₦${item.revenue.toFixed(2)}</td>
+                <td>${(item.margin_pct * 100).toFixed(1)}%</td>
             `;
             tableBody.appendChild(row);
         });
@@ -762,13 +899,7 @@ async function generateReport(e) {
         showLoading('#report-output');
         reportOutput.classList.remove('hidden');
         
-        const response = await fetch('/report', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/x-www-form-urlencoded',
-            },
-            body: `report_type=${reportType}`
-        });
+        const response = await cachedFetch(`/report?report_type=${encodeURIComponent(reportType)}`);
         
         const data = await response.json();
         
@@ -867,14 +998,17 @@ async function downloadDashboardReport() {
         for (const chartId of chartIds) {
             const config = CHART_CONFIG[chartId];
             const imgElement = document.getElementById(`${chartId}-chart-img`);
+            const canvasElement = document.getElementById(config.canvasId);
+            const imgData = canvasElement && canvasElement.toDataURL
+                ? canvasElement.toDataURL('image/png')
+                : imgElement && imgElement.src;
             
-            if (imgElement && imgElement.src) {
+            if (imgData) {
                 // Add chart title
                 doc.setFontSize(12);
                 doc.text(config.title, 15, yPosition - 5);
                 
                 // Add chart image
-                const imgData = imgElement.src;
                 doc.addImage(imgData, 'PNG', 15, yPosition, 120, 60);
                 
                 yPosition += 70;
@@ -995,7 +1129,7 @@ async function loadVisualizationData() {
         showAllChartsLoading();
         
         // Get selected time period
-        const timePeriod = document.getElementById('time-period')?.value || 'day';
+        const timePeriod = document.getElementById('time-period')?.value || 'auto';
         
         // Load data for each chart
         await Promise.all([
@@ -1033,60 +1167,47 @@ function showAllChartsLoading() {
     });
 }
 
-async function loadChart(chartId, chartType, timePeriod = 'day') {
+async function loadChart(chartId, chartType, timePeriod = 'auto') {
+    const config = CHART_CONFIG[chartId];
+    const container = document.getElementById(config.container);
     try {
-        const config = CHART_CONFIG[chartId];
-        const container = document.getElementById(config.container);
-        
         // Show loading state
         container.innerHTML = `<div class="loading-spinner">Loading...</div>`;
 
-        const response = await fetch('/visualize', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                chart_type: chartType,
-                time_period: timePeriod,
-                chart_id: chartId,
-                dashboard_view: true
-            })
-        });
-
+        // Aggregated series only; the browser does the drawing
+        const params = new URLSearchParams({ resolution: timePeriod });
+        if (chartId === 'revenue' && document.getElementById('show-forecast')?.checked) {
+            params.set('forecast', FORECAST_DAYS);
+        }
+        const response = await cachedFetch(`/api/charts/${chartId}?${params}`);
         const data = await response.json();
-        console.log(`Chart ${chartId} data:`, data); // Debug log
 
-        if (!data.plot_data) {
-            throw new Error('No plot data received');
+        if (!response.ok) {
+            throw new Error(data.error || `Error loading ${chartId} chart`);
         }
 
-        // Debug: Check image data format
-        console.log(`Image data starts with: ${data.plot_data.substring(0, 30)}...`);
-
-        // Create image element programmatically
-        const img = document.createElement('img');
-        img.id = config.imgId;
-        img.className = 'chart-image';
-        img.src = `data:image/png;base64,${data.plot_data}`;
-        img.alt = config.title;
-        img.onload = () => console.log(`Chart ${chartId} image loaded successfully`);
-        img.onerror = (e) => console.error(`Chart ${chartId} image failed to load`, e);
-
         // Build container structure
         container.innerHTML = '';
         const header = document.createElement('div');
         header.className = 'chart-header';
         header.innerHTML = `<h4>${config.title}</h4>`;
-        
-        const imageContainer = document.createElement('div');
-        imageContainer.className = 'chart-image-container';
-        imageContainer.appendChild(img);
-        
+
+        const wrapper = document.createElement('div');
+        wrapper.className = 'chart-wrapper';
+        const canvas = document.createElement('canvas');
+        canvas.id = config.canvasId;
+        wrapper.appendChild(canvas);
+
         container.appendChild(header);
-        container.appendChild(imageContainer);
+        container.appendChild(wrapper);
+
+        if (chartInstances[chartId]) {
+            chartInstances[chartId].destroy();
+        }
+        chartInstances[chartId] = renderChartData(canvas, data, config.title);
 
     } catch (error) {
         console.error(`Error loading ${chartId} chart:`, error);
-        const container = document.getElementById(config.container);
         container.innerHTML = `
             <div class="error-message">
                 <i class="fas fa-exclamation-circle"></i>
@@ -1096,5 +1217,89 @@ async function loadChart(chartId, chartType, timePeriod = 'day') {
     }
 }
 
+const FORECAST_DAYS = 28;
+
+const CHART_COLORS = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6', '#1abc9c', '#34495e', '#e67e22'];
+
+// Draw /api/charts data onto a canvas; returns the Chart.js instance (if any)
+function renderChartData(canvas, data, title) {
+    if (data.kind === 'heatmap') {
+        drawHeatmap(canvas, data);
+        return null;
+    }
+
+    const isLine = data.kind === 'line';
+    const forecast = isLine ? data.forecast : null;
+    let labels = isLine ? data.labels : data.labels.slice();
+    const datasets = [{
+        label: title,
+        data: data.values,
+        borderColor: '#3498db',
+        backgroundColor: data.kind === 'pie' ? CHART_COLORS : 'rgba(52, 152, 219, 0.6)',
+        pointRadius: isLine ? 0 : undefined,
+        borderWidth: isLine ? 2 : 1
+    }];
+
+    if (forecast && forecast.values.length) {
+        // Forecast points follow the history on a shared axis; each series
+        // is padded with nulls where it has no value
+        const offset = labels.length - (labels.includes(forecast.labels[0]) ? 1 : 0);
+        labels = labels.slice(0, offset).concat(forecast.labels);
+        const pad = values => Array(offset).fill(null).concat(values);
+        const band = forecast.intervals['80'];
+        datasets.push(
+            { label: '80% interval', data: pad(band.lower), borderWidth: 0, pointRadius: 0, fill: false },
+            { label: '80% interval', data: pad(band.upper), borderWidth: 0, pointRadius: 0,
+              fill: '-1', backgroundColor: 'rgba(243, 156, 18, 0.2)' },
+            { label: 'Forecast', data: pad(forecast.values), borderColor: '#f39c12',
+              borderDash: [6, 4], borderWidth: 2, pointRadius: 0, fill: false }
+        );
+    }
+
+    return new Chart(canvas.getContext('2d'), {
+        type: { line: 'line', bar: 'bar', pie: 'doughnut' }[data.kind],
+        data: {
+            labels: isLine ? labels.map(label => new Date(label).toLocaleDateString()) : labels,
+            datasets: datasets
+        },
+        options: {
+            responsive: true,
+            animation: false,
+            plugins: { legend: { display: data.kind === 'pie' || Boolean(forecast) } }
+        }
+    });
+}
+
+// Chart.js has no heatmap type, so paint the hour x weekday grid directly
+function drawHeatmap(canvas, data) {
+    const width = canvas.parentElement.clientWidth || 600;
+    const cellHeight = 14;
+    const left = 40, top = 20;
+    canvas.width = width;
+    canvas.height = top + cellHeight * Math.max(data.hours.length, 1) + 10;
+
+    const ctx = canvas.getContext('2d');
+    const cellWidth = (width - left) / data.days.length;
+    const max = Math.max(1, ...data.values.flat());
+
+    ctx.font = '11px sans-serif';
+    ctx.fillStyle = '#333';
+    data.days.forEach((day, col) => {
+        ctx.fillText(day.slice(0, 3), left + col * cellWidth + 4, top - 6);
+    });
+
+    data.hours.forEach((hour, row) => {
+        ctx.fillStyle = '#333';
+        ctx.fillText(`${hour}:00`, 2, top + row * cellHeight + cellHeight - 3);
+        data.values[row].forEach((value, col) => {
+            // Light yellow to dark blue, as in the server-rendered YlGnBu map
+            const t = value / max;
+            const r = Math.round(255 - t * 221), g = Math.round(255 - t * 161), b = Math.round(204 - t * 36);
+            ctx.fillStyle = `rgb(${r}, ${g}, ${b})`;
+            ctx.fillRect(left + col * cellWidth, top + row * cellHeight, cellWidth - 1, cellHeight - 1);
+        });
+    });
+}
+
 console.log('Response status:', response.status);
 console.log('Response data:', data);
\ No newline at end of file
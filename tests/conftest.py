@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+import pytest
+
+# app reads DATABASE_URL when it is imported
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='app-tests-'), 'test.db')
+
+import app as application  # noqa: E402
+from chart_cache import ChartCache  # noqa: E402
+from snapshot_store import SnapshotStore  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The Flask app inside an application context, on empty tables."""
+    flask_app = application.app
+    config = dict(flask_app.config)
+    flask_app.config.update(TESTING=True, RENDER_WORKERS=0,
+                            PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    monkeypatch.setattr(application, 'chart_cache', ChartCache(disk_dir=str(tmp_path / 'chart_cache')))
+    monkeypatch.setattr(application, 'snapshot_store', SnapshotStore(str(tmp_path / 'snapshots')))
+    with flask_app.app_context():
+        application.db.create_all()
+        yield flask_app
+        application.db.session.remove()
+        application.db.drop_all()
+    application.shutdown_executors()
+    application.auth_limiter = None
+    flask_app.config.clear()
+    flask_app.config.update(config)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app):
+    user = application.User(name='Test', email='test@example.com',
+                            password=application.hash_password('secret'))
+    application.db.session.add(user)
+    application.db.session.commit()
+    return user
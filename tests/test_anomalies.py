@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from app import AnomalyStat, Transaction, db, detect_anomalies, ingest_transactions
+
+
+def make_transactions(days=60, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for day in pd.date_range('2024-01-01', periods=days, freq='D'):
+        for _ in range(rng.integers(3, 9)):
+            category = rng.choice(['Food', 'Rent', 'Travel'])
+            rows.append({
+                'date': day.strftime('%Y-%m-%d'),
+                'amount': round(float(rng.normal({'Food': 20, 'Rent': 900, 'Travel': 150}[category], 5)), 2),
+                'category': category,
+                'description': '',
+                'recipient': f"R{rng.integers(0, 6)}",
+            })
+    frame = pd.DataFrame(rows)
+    # Outliers and a burst of payments to one recipient
+    frame.loc[len(frame) // 2, 'amount'] = 5000.0
+    frame.loc[len(frame) // 3, 'amount'] = 0.5
+    burst = pd.DataFrame([{'date': '2024-02-10', 'amount': 20.0, 'category': 'Food',
+                           'description': '', 'recipient': 'Burst'}] * 8)
+    return pd.concat([frame, burst], ignore_index=True).sort_values('date', kind='stable', ignore_index=True)
+
+
+def stored_flags(user_id):
+    return db.session.execute(
+        db.select(Transaction.is_anomaly, Transaction.anomaly_reason)
+        .where(Transaction.user_id == user_id).order_by(Transaction.id)
+    ).all()
+
+
+def stored_stats(user_id):
+    return sorted((s.dimension, s.key, s.count, round(s.total, 6), round(s.total_sq, 4))
+                  for s in AnomalyStat.query.filter_by(user_id=user_id))
+
+
+def test_incremental_scoring_matches_full_rescan(user):
+    frame = make_transactions()
+    # Batches split on day boundaries, so every batch comes after the ones before it
+    for days in np.array_split(frame['date'].unique(), 4):
+        batch = frame[frame['date'].isin(days)].reset_index(drop=True)
+        ingest_transactions(batch, user.id, chunk_size=50)
+
+    incremental = stored_flags(user.id)
+    incremental_stats = stored_stats(user.id)
+    assert {reason for _, reason in incremental} >= {
+        "Amount significantly higher than average for category",
+        "Amount significantly lower than average for category",
+        "Frequent transactions to same recipient",
+    }
+
+    detect_anomalies(user.id)
+    db.session.commit()
+
+    assert stored_flags(user.id) == incremental
+    assert stored_stats(user.id) == incremental_stats
@@ -0,0 +1,74 @@
+import app as application
+from ratelimit import MemoryBucketStore, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    store = MemoryBucketStore(clock=clock)
+    assert [store.take('k', 3, 0.5) for _ in range(3)] == [0, 0, 0]
+    assert store.take('k', 3, 0.5) == 2.0  # One token at 0.5/s
+    clock.now += 1
+    assert store.take('k', 3, 0.5) == 1.0  # Half a token so far; nothing taken
+    clock.now += 1
+    assert store.take('k', 3, 0.5) == 0
+
+
+def test_bucket_store_forgets_least_recently_used_keys():
+    store = MemoryBucketStore(max_keys=2, clock=FakeClock())
+    store.take('a', 1, 1.0)
+    store.take('b', 1, 1.0)
+    store.take('a', 1, 1.0)
+    store.take('c', 1, 1.0)
+    assert len(store) == 2
+    assert store.take('b', 1, 1.0) == 0  # Evicted, so it starts full again
+
+
+def test_limiter_stops_at_first_rejected_scope():
+    clock = FakeClock()
+    limiter = RateLimiter({'ip': (1, 1.0), 'email': (5, 1.0)}, MemoryBucketStore(clock=clock))
+    assert limiter.hit(ip='1.2.3.4', email='a@x') == 0
+    assert limiter.hit(ip='1.2.3.4', email='a@x') == 1.0
+    # The refused attempt did not charge the email bucket
+    assert [limiter.hit(ip=f"10.0.0.{i}", email='a@x') for i in range(5)] == [0, 0, 0, 0, 1.0]
+
+
+def login(client, email, password='wrong', ip='127.0.0.1'):
+    return client.post('/login', data={'email': email, 'password': password},
+                       environ_base={'REMOTE_ADDR': ip})
+
+
+def test_login_is_rate_limited_per_email(app, client, user):
+    app.config.update(AUTH_EMAIL_LIMIT=(2, 1 / 60))
+    assert [login(client, user.email, ip=f"10.0.0.{i}").status_code for i in range(2)] == [200, 200]
+    response = login(client, user.email, password='secret', ip='10.0.0.9')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '60'
+
+
+def test_login_is_rate_limited_per_ip(app, client, user):
+    app.config.update(AUTH_IP_LIMIT=(3, 1 / 60))
+    codes = [login(client, f"user{i}@example.com").status_code for i in range(4)]
+    assert codes == [200, 200, 200, 429]
+    assert login(client, user.email, password='secret', ip='10.0.0.1').status_code == 302
+
+
+def test_login_refused_with_503_when_hashing_pool_is_full(app, client, user):
+    app.config.update(AUTH_VERIFY_WORKERS=1, AUTH_VERIFY_QUEUE=0)
+    assert application.offload_password_hash(len, 'started')
+    # Hold the only slot, as a login stuck hashing would
+    assert application.auth_slots.acquire(blocking=False)
+    try:
+        response = login(client, user.email, password='secret')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        application.auth_slots.release()
+    assert login(client, user.email, password='secret').status_code == 302
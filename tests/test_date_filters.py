@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from app import Sale, Transaction, db
+
+
+@pytest.fixture
+def logged_in(client, user):
+    for day, hour in [(30, 9), (31, 0), (31, 18), (31, 23), (1, 0)]:
+        month = 6 if day == 1 else 5
+        date = datetime(2024, month, day, hour)
+        db.session.add(Transaction(user_id=user.id, date=date, amount=10.0, category='Food'))
+        db.session.add(Sale(user_id=user.id, date=date, total_amount=10.0))
+    db.session.commit()
+    with client.session_transaction() as session:
+        session['user_id'] = user.id
+    return client
+
+
+def dates(client, url, key):
+    response = client.get(url)
+    assert response.status_code == 200
+    return sorted(row['date'] for row in response.get_json()[key])
+
+
+@pytest.mark.parametrize('url,key', [('/api/transactions', 'transactions'),
+                                     ('/api/sales-data', 'sales')])
+def test_date_only_end_includes_that_day(logged_in, url, key):
+    assert dates(logged_in, f"{url}?start=2024-05-31&end=2024-05-31", key) == [
+        '2024-05-31T00:00:00', '2024-05-31T18:00:00', '2024-05-31T23:00:00']
+    # A full datetime end is still exclusive
+    assert dates(logged_in, f"{url}?start=2024-05-31&end=2024-05-31T18:00:00", key) == [
+        '2024-05-31T00:00:00']
+
+
+def test_invalid_end_is_rejected(logged_in):
+    assert logged_in.get('/api/transactions?end=May').status_code == 400
+    assert logged_in.get('/api/sales-data?end=2024-13-01').status_code == 400
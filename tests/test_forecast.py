@@ -0,0 +1,63 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import IntegrityError
+
+import app as application
+from app import ForecastModel, db, ingest_transactions, user_forecast
+
+
+def test_concurrent_first_forecasts_after_ingest_all_succeed(app, user):
+    rng = np.random.default_rng(2)
+    days = pd.date_range('2024-01-01', periods=90, freq='D')
+    ingest_transactions(pd.DataFrame({
+        'date': days.strftime('%Y-%m-%d'),
+        'amount': (100 + 20 * np.sin(np.arange(90) * 2 * np.pi / 7) + rng.normal(0, 5, 90)).round(2),
+        'category': 'Food', 'description': '', 'recipient': 'Shop',
+    }), user.id)
+    user_id = user.id
+    db.session.remove()
+
+    barrier = threading.Barrier(6)
+    results, errors = [], []
+
+    def first_request():
+        with app.app_context():
+            barrier.wait()
+            try:
+                results.append(user_forecast(user_id, 'transaction', 14))
+            except Exception as e:
+                errors.append(repr(e))
+
+    threads = [threading.Thread(target=first_request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(results) == 6
+    assert all(len(result['series']) == 14 for result in results)
+    assert ForecastModel.query.filter_by(user_id=user_id).count() == 1
+    assert ForecastModel.query.one().data_version == application.get_data_version(user_id)
+
+
+def test_forecast_uses_the_concurrent_refit_after_a_conflict(app, user, monkeypatch):
+    days = pd.date_range('2024-01-01', periods=30, freq='D')
+    ingest_transactions(pd.DataFrame({
+        'date': days.strftime('%Y-%m-%d'), 'amount': 50.0,
+        'category': 'Food', 'description': '', 'recipient': 'Shop',
+    }), user.id)
+    fit_forecasts = application.fit_forecasts
+
+    def refit_loses_race(source, user_ids=None):
+        # Another request stores its fit first, then this one hits the key
+        fit_forecasts(source, user_ids)
+        db.session.commit()
+        raise IntegrityError('INSERT INTO forecast_model', None, Exception('UNIQUE constraint failed'))
+
+    monkeypatch.setattr(application, 'fit_forecasts', refit_loses_race)
+    result = user_forecast(user.id, 'transaction', 7)
+    assert len(result['series']) == 7
+    assert result['series']['value'].round(6).eq(50.0).all()
@@ -0,0 +1,67 @@
+import os
+import socket
+import subprocess
+import time
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as application
+from app import Job, db, requeue_interrupted_jobs, submit_job
+
+
+def running_job(job_id, user, worker, started_at):
+    return Job(id=job_id, user_id=user.id, kind='anomaly-scan', status='running',
+               worker=worker, started_at=started_at)
+
+
+def test_requeue_checks_local_workers_and_times_out_others(app, user):
+    exited = subprocess.Popen(['true'])
+    exited.wait()
+    host = socket.gethostname()
+    old = datetime.utcnow() - timedelta(seconds=app.config['JOB_STALE_SECONDS'] + 60)
+    recent = datetime.utcnow()
+    db.session.add_all([
+        # A long job on a live local worker keeps running, however old
+        running_job('live-old', user, f"{host}:{os.getpid()}", old),
+        running_job('dead-recent', user, f"{host}:{exited.pid}", recent),
+        running_job('remote-old', user, 'elsewhere:1', old),
+        running_job('remote-recent', user, 'elsewhere:1', recent),
+        running_job('unknown-old', user, None, old),
+    ])
+    db.session.commit()
+
+    requeue_interrupted_jobs()
+
+    statuses = dict(db.session.query(Job.id, Job.status).all())
+    assert statuses == {
+        'live-old': 'running',
+        'dead-recent': 'queued',
+        'remote-old': 'queued',
+        'remote-recent': 'running',
+        'unknown-old': 'queued',
+    }
+
+
+def wait_for_job(job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        db.session.expire_all()
+        job = db.session.get(Job, job_id)
+        if job.status in ('done', 'error'):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"Job {job_id} still {job.status}")
+
+
+def test_job_pool_is_replaced_after_a_worker_dies(app, user):
+    app.config.update(JOB_WORKERS=1)
+    broken = application.get_job_executor()
+    # Kill the worker the way an OOM kill would
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result(timeout=30)
+
+    job = submit_job(user.id, 'anomaly-scan')
+    assert wait_for_job(job.id).status == 'done'
+    assert application.job_executor is not broken
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter, where pandas has not been imported yet
+FIRST_USE_RACE = '''
+import sys
+import threading
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+assert 'pandas' not in sys.modules
+barrier = threading.Barrier(8)
+errors = []
+
+def first_use():
+    barrier.wait()
+    try:
+        pd.DataFrame({'a': [1]})
+    except Exception as e:
+        errors.append(repr(e))
+
+threads = [threading.Thread(target=first_use) for _ in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print(errors)
+'''
+
+
+def test_threads_racing_on_first_use_see_the_loaded_module():
+    result = subprocess.run([sys.executable, '-c', FIRST_USE_RACE], cwd=ROOT,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '[]'
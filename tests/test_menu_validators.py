@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from app import MenuItem, chart_version, db, ingest_sales_stream
+
+
+@pytest.fixture
+def logged_in(client, user):
+    db.session.add_all([MenuItem(name=f"Item {i}", category='Main', price=10.0 + i, cost=4.0)
+                        for i in range(3)])
+    db.session.commit()
+    sales = '\n'.join(json.dumps({
+        'key': f"S{i}", 'date': f"2024-04-{1 + i % 28:02d}T12:00:00",
+        'items': [{'menu_item_id': 1 + i % 3, 'quantity': 1}, {'menu_item_id': 1 + (i + 1) % 3, 'quantity': 2}],
+    }) for i in range(30))
+    ingest_sales_stream(io.StringIO(sales), user.id)
+    with client.session_transaction() as session:
+        session['user_id'] = user.id
+    return client
+
+
+def edit_menu_item():
+    item = db.session.get(MenuItem, 1)
+    item.name = 'Renamed'
+    item.cost = 9.0
+    db.session.commit()
+
+
+@pytest.mark.parametrize('url', ['/api/menu-profitability', '/api/sales-data',
+                                 '/api/charts/top-items?source=sale'])
+def test_menu_edits_invalidate_conditional_responses(logged_in, url):
+    first = logged_in.get(url)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert 'Last-Modified' not in first.headers
+    assert logged_in.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    edit_menu_item()
+    after = logged_in.get(url, headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert b'Renamed' in after.data
+
+
+def test_menu_edits_change_menu_chart_cache_keys(logged_in, user):
+    before = chart_version(user.id, 'top-items'), chart_version(user.id, 'report:top-items')
+    unrelated = chart_version(user.id, 'revenue')
+    edit_menu_item()
+    assert chart_version(user.id, 'top-items') != before[0]
+    assert chart_version(user.id, 'report:top-items') != before[1]
+    assert chart_version(user.id, 'revenue') == unrelated
@@ -0,0 +1,21 @@
+import pytest
+
+
+def test_metrics_hidden_without_a_token(client):
+    assert client.get('/metrics').status_code == 404
+    assert client.get('/metrics', headers={'Authorization': 'Bearer '}).status_code == 404
+
+
+@pytest.mark.parametrize('header', [None, 'Bearer wrong', 'scrape-secret'])
+def test_metrics_need_the_bearer_token(app, client, header):
+    app.config.update(METRICS_TOKEN='scrape-secret')
+    headers = {'Authorization': header} if header else {}
+    assert client.get('/metrics', headers=headers).status_code == 404
+
+
+def test_metrics_served_to_scraper_with_token(app, client):
+    app.config.update(METRICS_TOKEN='scrape-secret')
+    client.get('/login')
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+    assert response.status_code == 200
+    assert 'app_requests_total' in response.get_data(as_text=True)
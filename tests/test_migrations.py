@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def head_revision():
+    config = Config()
+    config.set_main_option('script_location', os.path.join(ROOT, 'migrations'))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def create_baseline_schema(engine):
+    # The tables as db.create_all() made them before migrations were added
+    metadata = sa.MetaData()
+    sa.Table('user', metadata,
+             sa.Column('id', sa.Integer, primary_key=True),
+             sa.Column('name', sa.String(100), nullable=False),
+             sa.Column('email', sa.String(100), unique=True, nullable=False),
+             sa.Column('password', sa.String(200), nullable=False),
+             sa.Column('created_at', sa.DateTime))
+    sa.Table('transaction', metadata,
+             sa.Column('id', sa.Integer, primary_key=True),
+             sa.Column('user_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+             sa.Column('date', sa.DateTime, nullable=False),
+             sa.Column('amount', sa.Float, nullable=False),
+             sa.Column('category', sa.String(100)),
+             sa.Column('description', sa.String(200)),
+             sa.Column('recipient', sa.String(100)),
+             sa.Column('is_anomaly', sa.Boolean),
+             sa.Column('anomaly_reason', sa.String(200)))
+    sa.Table('menu_item', metadata,
+             sa.Column('id', sa.Integer, primary_key=True),
+             sa.Column('name', sa.String(100), nullable=False),
+             sa.Column('category', sa.String(50), nullable=False),
+             sa.Column('price', sa.Float, nullable=False),
+             sa.Column('cost', sa.Float, nullable=False),
+             sa.Column('is_active', sa.Boolean))
+    sa.Table('sale', metadata,
+             sa.Column('id', sa.Integer, primary_key=True),
+             sa.Column('user_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+             sa.Column('date', sa.DateTime, nullable=False),
+             sa.Column('total_amount', sa.Float, nullable=False),
+             sa.Column('payment_method', sa.String(50)),
+             sa.Column('customer_count', sa.Integer),
+             sa.Column('time_of_day', sa.String(20)))
+    sa.Table('sale_item', metadata,
+             sa.Column('id', sa.Integer, primary_key=True),
+             sa.Column('sale_id', sa.Integer, sa.ForeignKey('sale.id'), nullable=False),
+             sa.Column('menu_item_id', sa.Integer, sa.ForeignKey('menu_item.id'), nullable=False),
+             sa.Column('quantity', sa.Integer, nullable=False),
+             sa.Column('price_at_sale', sa.Float, nullable=False),
+             sa.Column('discount', sa.Float))
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables['user'].insert(),
+                     {'id': 1, 'name': 'Old', 'email': 'old@example.com', 'password': 'x'})
+        conn.execute(metadata.tables['transaction'].insert(),
+                     {'user_id': 1, 'date': datetime(2024, 1, 1), 'amount': 12.5, 'category': 'Food'})
+
+
+def run(database_url, *args):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+@pytest.mark.parametrize('existing', ['empty', 'baseline'])
+def test_init_database_upgrades_to_head(tmp_path, existing):
+    database_url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = sa.create_engine(database_url)
+    if existing == 'baseline':
+        create_baseline_schema(engine)
+
+    result = run(database_url, '-c', 'import app\nwith app.app.app_context(): app.init_database()')
+    assert result.returncode == 0, result.stderr
+
+    with engine.connect() as conn:
+        assert conn.execute(sa.text('SELECT version_num FROM alembic_version')).scalar() == head_revision()
+        if existing == 'baseline':
+            assert conn.execute(sa.text('SELECT amount FROM "transaction"')).scalar() == 12.5
+    engine.dispose()
+
+    # The migrated schema matches the models
+    result = run(database_url, '-m', 'flask', '--app', 'app', 'db', 'check')
+    assert result.returncode == 0, result.stdout + result.stderr
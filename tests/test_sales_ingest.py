@@ -0,0 +1,62 @@
+import io
+import json
+
+from app import MenuItem, Sale, SaleItem, db, get_data_version, ingest_sales_stream
+
+CSV_HEADER = 'key,date,payment_method,customer_count,menu_item_id,quantity,discount,price\n'
+
+
+def add_menu(count=3):
+    db.session.add_all([MenuItem(name=f"Item {i}", category='Main', price=10.0 + i, cost=4.0)
+                        for i in range(count)])
+    db.session.commit()
+
+
+def feed(count):
+    return '\n'.join(json.dumps({
+        'key': f"S{i}",
+        'date': f"2024-04-{1 + i % 28:02d}T12:15:00",
+        'payment_method': 'Card',
+        'customer_count': 2,
+        'items': [{'menu_item_id': 1, 'quantity': 2}, {'menu_item_id': 2 + i % 2, 'quantity': 1}],
+    }) for i in range(count)) + '\n'
+
+
+def counts():
+    return Sale.query.count(), SaleItem.query.count()
+
+
+def test_retried_ndjson_feed_is_deduplicated(user):
+    add_menu()
+    first = ingest_sales_stream(io.StringIO(feed(50)), user.id, 'ndjson', chunk_size=16)
+    assert first['sales_accepted'] == 50
+    assert first['items_accepted'] == 100
+    version = get_data_version(user.id)
+
+    retry = ingest_sales_stream(io.StringIO(feed(50)), user.id, 'ndjson', chunk_size=7)
+    assert retry['sales_accepted'] == 0
+    assert retry['sales_duplicate'] == 50
+    assert retry['items_accepted'] == 0
+    assert counts() == (50, 100)
+    assert get_data_version(user.id) == version
+
+    # A feed that overlaps the stored one only adds the new sales
+    extended = ingest_sales_stream(io.StringIO(feed(60)), user.id, 'ndjson')
+    assert extended['sales_accepted'] == 10
+    assert counts() == (60, 120)
+
+
+def test_retried_csv_feed_is_deduplicated_across_chunk_boundaries(user):
+    add_menu()
+    # Three lines per sale; the chunk sizes split sales across chunks
+    csv = CSV_HEADER + ''.join(f"C{i // 3},2024-05-02 12:30:00,Cash,1,{1 + i % 3},1,,\n"
+                               for i in range(90))
+    first = ingest_sales_stream(io.StringIO(csv), user.id, 'csv', chunk_size=8)
+    retry = ingest_sales_stream(io.StringIO(csv), user.id, 'csv', chunk_size=5)
+
+    assert (first['sales_accepted'], first['items_accepted']) == (30, 90)
+    assert (retry['sales_accepted'], retry['sales_duplicate']) == (0, 30)
+    assert counts() == (30, 90)
+    per_sale = db.session.execute(
+        db.select(db.func.count()).select_from(SaleItem).group_by(SaleItem.sale_id)).scalars().all()
+    assert set(per_sale) == {3}